@@ -1,28 +1,57 @@
 #!/usr/bin/env python3
 
-import json
-import psycopg2
+import os
+import re
+import concurrent.futures
 import duckdb
+import pandas as pd
+import pyarrow as pa
+import sqlglot
+from prompt_toolkit import PromptSession
+from prompt_toolkit.completion import WordCompleter
+from prompt_toolkit.history import FileHistory
 
-from config import DB_CONFIG
+from config import get_pg_pool
 
 """
 Interactive CLI for querying DuckLake using DuckDB
 Provides a SQL shell to query tables registered in the catalog
 """
 
+DUCKDB_CACHE_PATH = os.path.expanduser('~/.ducklake/cache.duckdb')
+
+# Rows shown for interactive queries; keeps accidental SELECT * bounded
+MAX_DISPLAY_ROWS = 1000
+
+HISTORY_PATH = os.path.expanduser('~/.ducklake_history')
+
+SQL_KEYWORDS = [
+    'SELECT', 'FROM', 'WHERE', 'GROUP BY', 'ORDER BY', 'HAVING', 'LIMIT',
+    'JOIN', 'LEFT JOIN', 'INNER JOIN', 'ON', 'AS', 'AND', 'OR', 'NOT',
+    'NULL', 'DISTINCT', 'COUNT', 'SUM', 'AVG', 'MIN', 'MAX', 'UNION',
+    'CASE', 'WHEN', 'THEN', 'ELSE', 'END', 'ASC', 'DESC'
+]
+
 class DuckLakeCLI:
     def __init__(self):
         self.pg_conn = None
         self.duck_conn = None
         self.current_namespace = 'default'
         self.table_registry = {}
+        self.views_ok = False
+        self._table_re = None
+        self._loc_map = {}
+        # Queries run on this worker so Ctrl-C can interrupt a long scan
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
         
     def connect(self):
         """Initialize connections"""
         try:
-            self.pg_conn = psycopg2.connect(**DB_CONFIG)
-            self.duck_conn = duckdb.connect()
+            self.pg_conn = get_pg_pool().getconn()
+
+            # Persistent database so views and extension state survive restarts
+            os.makedirs(os.path.dirname(DUCKDB_CACHE_PATH), exist_ok=True)
+            self.duck_conn = duckdb.connect(DUCKDB_CACHE_PATH)
             
             # Setup DuckDB for S3/MinIO
             self.duck_conn.execute("INSTALL httpfs")
@@ -34,6 +63,15 @@ class DuckLakeCLI:
                 SET s3_use_ssl=false;
                 SET s3_url_style='path';
             """)
+
+            # Cache parquet footers/objects and parallelize S3 range reads
+            self.duck_conn.execute(f"""
+                SET enable_http_metadata_cache=true;
+                SET enable_object_cache=true;
+                SET http_keep_alive=true;
+                SET http_retries=5;
+                SET threads={os.cpu_count()};
+            """)
             
             self._load_tables()
             return True
@@ -43,27 +81,91 @@ class DuckLakeCLI:
     
     def _load_tables(self):
         """Load table metadata from catalog"""
-        cur = self.pg_conn.cursor()
+        # Server-side cursor streams rows in batches instead of pulling
+        # the whole catalog into memory at once
+        cur = self.pg_conn.cursor(name='load_tables_cur')
+        cur.itersize = 500
         cur.execute("""
-            SELECT n.namespace_name, t.table_name, t.location, t.schema_json
+            SELECT n.namespace_name, t.table_name, t.location,
+                   t.schema_json, t.schema_arrow
             FROM tables t
             JOIN namespaces n ON t.namespace_id = n.namespace_id
         """)
-        
-        for namespace, table_name, location, schema_json in cur.fetchall():
+
+        for namespace, table_name, location, schema_json, schema_arrow in cur:
             full_name = f"{namespace}.{table_name}"
-            # Handle both dict and string JSON
-            if isinstance(schema_json, dict):
-                schema = schema_json
+
+            # Prefer the Arrow IPC schema: no JSON parse, one buffer read.
+            # schema_json stays as fallback for rows ingested before the
+            # schema_arrow column existed (JSONB comes back as a dict).
+            if schema_arrow is not None:
+                arrow_schema = pa.ipc.read_schema(
+                    pa.BufferReader(bytes(schema_arrow))
+                )
+                schema = {
+                    'fields': [
+                        {
+                            'name': field.name,
+                            'type': str(field.type),
+                            'nullable': field.nullable
+                        }
+                        for field in arrow_schema
+                    ]
+                }
             else:
-                schema = json.loads(schema_json)
-            
+                schema = schema_json
+
             self.table_registry[full_name] = {
                 'location': location,
                 'schema': schema
             }
-        
+
         cur.close()
+        # End the transaction the named cursor opened
+        self.pg_conn.commit()
+
+        # Single-pass, word-boundary-anchored rewrite used as fallback
+        # if view registration fails (longest names first so namespaced
+        # references win over bare table names)
+        self._loc_map = {
+            name: meta['location'] for name, meta in self.table_registry.items()
+        }
+        if self._loc_map:
+            names = sorted(self._loc_map, key=len, reverse=True)
+            self._table_re = re.compile(
+                r'\b(' + '|'.join(map(re.escape, names)) + r')\b'
+            )
+
+        try:
+            self._register_views()
+            self.views_ok = True
+        except Exception as e:
+            print(f"⚠️  Could not register DuckDB views ({e}), "
+                  f"falling back to table name rewriting")
+
+    def _register_views(self):
+        """Expose catalog tables as DuckDB views over their parquet locations"""
+        if not self.table_registry:
+            return
+
+        # Build one multi-statement batch inside a single transaction so
+        # DuckDB parses and commits once instead of per view
+        statements = []
+        seen_namespaces = set()
+        for full_name, metadata in self.table_registry.items():
+            namespace, table_name = full_name.split('.', 1)
+            location = metadata['location'].replace("'", "''")
+
+            # One schema per namespace so namespace.table resolves natively
+            if namespace not in seen_namespaces:
+                statements.append(f'CREATE SCHEMA IF NOT EXISTS "{namespace}"')
+                seen_namespaces.add(namespace)
+            statements.append(
+                f'CREATE OR REPLACE VIEW "{namespace}"."{table_name}" '
+                f"AS SELECT * FROM read_parquet('{location}')"
+            )
+
+        self.duck_conn.execute('BEGIN; ' + ';\n'.join(statements) + '; COMMIT;')
     
     def list_tables(self):
         """Display available tables"""
@@ -94,28 +196,117 @@ class DuckLakeCLI:
             print(f"  {field['name']:<30} {field['type']:<20} {nullable}")
         print("-" * 80)
     
+    def _rewrite_table_refs(self, sql):
+        """Rewrite registered table references for execution.
+
+        With views available, quote namespace.table references so
+        reserved-word namespaces like "default" still parse; without
+        views, rewrite them to read_parquet() calls over the table's
+        location. Parses the query once so names inside string literals
+        or column references are left alone; the precompiled regex pass
+        covers queries sqlglot cannot parse.
+        """
+        try:
+            tree = sqlglot.parse_one(sql, read='duckdb')
+        except sqlglot.errors.ParseError:
+            if self.views_ok:
+                return self._table_re.sub(
+                    lambda m: '.'.join(
+                        f'"{part}"' for part in m.group(1).split('.')
+                    ),
+                    sql
+                )
+            return self._table_re.sub(
+                lambda m: f"'{self._loc_map[m.group(1)]}'", sql
+            )
+
+        for table in tree.find_all(sqlglot.exp.Table):
+            key = f"{table.db}.{table.name}" if table.db else table.name
+            location = self._loc_map.get(key)
+            if location is None:
+                continue
+
+            if self.views_ok:
+                table.this.set('quoted', True)
+                if table.args.get('db'):
+                    table.args['db'].set('quoted', True)
+            else:
+                func = sqlglot.exp.func(
+                    'read_parquet', sqlglot.exp.Literal.string(location)
+                )
+                # Keep the table's alias (defaulting to its bare name)
+                # so qualified column references still resolve
+                table.replace(sqlglot.exp.alias_(
+                    func, table.alias or table.name, table=False
+                ))
+
+        return tree.sql(dialect='duckdb')
+
+    def _fetch_preview(self, sql):
+        """Execute sql and fetch chunks up to the display limit.
+
+        Runs on the worker thread; stops once the limit is covered
+        instead of materializing the whole result as a DataFrame.
+        """
+        rel = self.duck_conn.execute(sql)
+        chunks = []
+        fetched = 0
+        while fetched <= MAX_DISPLAY_ROWS:
+            chunk = rel.fetch_df_chunk()
+            if chunk is None or len(chunk) == 0:
+                break
+            chunks.append(chunk)
+            fetched += len(chunk)
+        return chunks
+
+    def _build_completer(self):
+        """Tab completion over table names, column names and SQL keywords"""
+        words = list(self.table_registry)
+        for metadata in self.table_registry.values():
+            words.extend(f['name'] for f in metadata['schema']['fields'])
+        words.extend(SQL_KEYWORDS)
+        return WordCompleter(words, ignore_case=True)
+
     def execute_query(self, sql):
         """Execute SQL query"""
         try:
-            # Replace table references with their S3 locations
-            modified_sql = sql
-            for table_name, metadata in self.table_registry.items():
-                if table_name in sql:
-                    modified_sql = modified_sql.replace(
-                        table_name,
-                        f"'{metadata['location']}'"
-                    )
-            
-            result = self.duck_conn.execute(modified_sql).fetchdf()
-            
-            if len(result) == 0:
+            # Registered names resolve through the views created in
+            # _load_tables, but need quoting because DuckDB reserves
+            # words like "default"; without views, true table references
+            # are rewritten to read_parquet() calls instead
+            if self._table_re:
+                sql = self._rewrite_table_refs(sql)
+
+            # Run on the worker thread and poll, so Ctrl-C during a long
+            # S3 scan interrupts DuckDB instead of freezing the prompt
+            future = self._executor.submit(self._fetch_preview, sql)
+            while True:
+                try:
+                    chunks = future.result(timeout=0.2)
+                    break
+                except concurrent.futures.TimeoutError:
+                    continue
+                except KeyboardInterrupt:
+                    self.duck_conn.interrupt()
+                    print("\n⚠️  Query cancelled")
+                    return
+
+            if not chunks:
                 print("Query returned no results")
                 return
-            
+
+            result = pd.concat(chunks, ignore_index=True)
+            truncated = len(result) > MAX_DISPLAY_ROWS
+            if truncated:
+                result = result.head(MAX_DISPLAY_ROWS)
+
             print("\n" + "=" * 80)
             print(result.to_string())
             print("=" * 80)
-            print(f"\n{len(result)} row(s) returned")
+            if truncated:
+                print(f"\nShowing first {MAX_DISPLAY_ROWS} row(s) (output truncated)")
+            else:
+                print(f"\n{len(result)} row(s) returned")
             
         except Exception as e:
             print(f"❌ Query error: {e}")
@@ -164,10 +355,15 @@ Tips:
         print("\nType \\h for help, \\q to quit\n")
         
         self.list_tables()
-        
+
+        session = PromptSession(
+            history=FileHistory(HISTORY_PATH),
+            completer=self._build_completer()
+        )
+
         while True:
             try:
-                query = input(f"\nducklake> ").strip()
+                query = session.prompt("\nducklake> ").strip()
                 
                 if not query:
                     continue
@@ -194,8 +390,9 @@ Tips:
                 break
         
         # Cleanup
+        self._executor.shutdown(wait=False)
         if self.pg_conn:
-            self.pg_conn.close()
+            get_pg_pool().putconn(self.pg_conn)
         if self.duck_conn:
             self.duck_conn.close()
 
@@ -1,3 +1,4 @@
+import psycopg2.pool
 from botocore.client import Config
 
 # Database configuration
@@ -17,3 +18,14 @@ MINIO_CONFIG = {
     'config': Config(signature_version='s3v4'),
     'region_name': 'us-east-1'
 }
+
+# Shared Postgres connection pool, created lazily so importing this
+# module does not require the catalog database to be up
+_pg_pool = None
+
+def get_pg_pool():
+    """Return the shared connection pool, creating it on first use"""
+    global _pg_pool
+    if _pg_pool is None:
+        _pg_pool = psycopg2.pool.ThreadedConnectionPool(1, 8, **DB_CONFIG)
+    return _pg_pool
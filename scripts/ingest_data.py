@@ -1,10 +1,11 @@
 import os
-import json
-import psycopg2
 import boto3
 import pyarrow.parquet as pq
+from boto3.s3.transfer import TransferConfig
+from psycopg2 import Binary
+from psycopg2.extras import Json
 
-from config import DB_CONFIG, MINIO_CONFIG
+from config import MINIO_CONFIG, get_pg_pool
 
 """
 Ingest parquet data into the DuckLake lakehouse
@@ -19,10 +20,10 @@ LOCAL_PARQUET_FILE = "data/popolazione_residente.parquet"
 TABLE_NAME = "popolazione_residente"
 
 def get_parquet_schema(file_path: str):
-    """Extract schema from parquet file"""
-    parquet_file = pq.read_table(file_path)
-    schema = parquet_file.schema
-    
+    """Extract schema from parquet file (footer-only read, no data loaded)"""
+    parquet_file = pq.ParquetFile(file_path)
+    schema = parquet_file.schema_arrow
+
     # Convert to a JSON-serializable format
     schema_dict = {
         'fields': [
@@ -34,72 +35,98 @@ def get_parquet_schema(file_path: str):
             for field in schema
         ]
     }
-    return schema_dict, parquet_file.num_rows
 
-def upload_to_minio(local_path, s3_path):
-    """Upload file to MinIO"""
-    s3_client = boto3.client('s3', **MINIO_CONFIG)
-    
-    # Ensure bucket exists
+    # Arrow IPC bytes let consumers skip JSON parsing entirely
+    schema_arrow = schema.serialize().to_pybytes()
+    return schema_dict, schema_arrow, parquet_file.metadata.num_rows
+
+# Reused across ingests: client construction loads the botocore service
+# model and resolves credentials, which costs tens of milliseconds
+S3_CLIENT = boto3.client('s3', **MINIO_CONFIG)
+_bucket_ready = False
+
+MB = 1024 * 1024
+
+# Multipart upload with concurrent parts so large files saturate the network
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * MB,
+    multipart_chunksize=16 * MB,
+    max_concurrency=min(16, (os.cpu_count() or 4) * 2),
+    use_threads=True
+)
+
+def ensure_bucket():
+    """Create the bucket if needed; checked once per process"""
+    global _bucket_ready
+    if _bucket_ready:
+        return
     try:
-        s3_client.head_bucket(Bucket=BUCKET_NAME)
+        S3_CLIENT.head_bucket(Bucket=BUCKET_NAME)
     except:
-        s3_client.create_bucket(Bucket=BUCKET_NAME)
+        S3_CLIENT.create_bucket(Bucket=BUCKET_NAME)
         print(f"✓ Created bucket: {BUCKET_NAME}")
-    
+    _bucket_ready = True
+
+def upload_to_minio(local_path, s3_path):
+    """Upload file to MinIO"""
+    ensure_bucket()
+
     # Upload file
-    s3_client.upload_file(local_path, BUCKET_NAME, s3_path)
+    S3_CLIENT.upload_file(local_path, BUCKET_NAME, s3_path, Config=TRANSFER_CONFIG)
     print(f"✓ Uploaded to MinIO: s3://{BUCKET_NAME}/{s3_path}")
     
     return f"s3://{BUCKET_NAME}/{s3_path}"
 
-def register_table_in_catalog(table_name, location, schema_dict, record_count):
+def register_table_in_catalog(table_name, location, schema_dict, schema_arrow,
+                              record_count, size_bytes):
     """Register table metadata in PostgreSQL catalog"""
-    conn = psycopg2.connect(**DB_CONFIG)
+    pool = get_pg_pool()
+    conn = pool.getconn()
     cur = conn.cursor()
     
     try:
-        # Get namespace_id
-        cur.execute(
-            "SELECT namespace_id FROM namespaces WHERE namespace_name = %s",
-            (NAMESPACE,)
-        )
-        namespace_id = cur.fetchone()[0]
-        
-        # Insert or update table metadata
+        # Resolve namespace, upsert table metadata and register the
+        # partition in a single round-trip
         cur.execute("""
-            INSERT INTO tables (
-                namespace_id, table_name, location, schema_json, properties
-            ) VALUES (%s, %s, %s, %s, %s)
-            ON CONFLICT (namespace_id, table_name) 
-            DO UPDATE SET 
-                location = EXCLUDED.location,
-                schema_json = EXCLUDED.schema_json,
-                updated_at = CURRENT_TIMESTAMP
+            WITH ns AS (
+                SELECT namespace_id FROM namespaces WHERE namespace_name = %s
+            ), up AS (
+                INSERT INTO tables (
+                    namespace_id, table_name, location, schema_json,
+                    schema_arrow, properties
+                )
+                SELECT ns.namespace_id, %s, %s, %s, %s, %s FROM ns
+                ON CONFLICT (namespace_id, table_name)
+                DO UPDATE SET
+                    location = EXCLUDED.location,
+                    schema_json = EXCLUDED.schema_json,
+                    schema_arrow = EXCLUDED.schema_arrow,
+                    updated_at = CURRENT_TIMESTAMP
+                RETURNING table_id
+            )
+            INSERT INTO partitions (
+                table_id, partition_spec, file_path, file_format,
+                record_count, file_size_bytes
+            )
+            SELECT table_id, %s, %s, %s, %s, %s FROM up
             RETURNING table_id
         """, (
-            namespace_id,
+            NAMESPACE,
             table_name,
             location,
-            json.dumps(schema_dict),
-            json.dumps({'record_count': record_count})
-        ))
-        
-        table_id = cur.fetchone()[0]
-        
-        # Register partition/file
-        cur.execute("""
-            INSERT INTO partitions (
-                table_id, partition_spec, file_path, file_format, record_count
-            ) VALUES (%s, %s, %s, %s, %s)
-        """, (
-            table_id,
-            json.dumps({}),  # No partitioning for now
+            Json(schema_dict),
+            Binary(schema_arrow),
+            Json({'record_count': record_count}),
+            Json({}),  # No partitioning for now
             location,
             'parquet',
-            record_count
+            record_count,
+            size_bytes
         ))
-        
+
+        if cur.fetchone() is None:
+            raise ValueError(f"Namespace '{NAMESPACE}' not found in catalog")
+
         conn.commit()
         print(f"✓ Registered table '{NAMESPACE}.{table_name}' in catalog")
         
@@ -108,7 +135,7 @@ def register_table_in_catalog(table_name, location, schema_dict, record_count):
         raise e
     finally:
         cur.close()
-        conn.close()
+        pool.putconn(conn)
 
 def ingest_parquet(local_file_path: str, table_name: str) -> None:
     """Main ingestion function"""
@@ -117,12 +144,15 @@ def ingest_parquet(local_file_path: str, table_name: str) -> None:
     
     if not os.path.exists(local_file_path):
         raise FileNotFoundError(f"File not found: {local_file_path}")
-    
+
+    size_bytes = os.path.getsize(local_file_path)
+
     # Get schema and stats
     print("\n1️⃣  Reading parquet file...")
-    schema_dict, record_count = get_parquet_schema(local_file_path)
+    schema_dict, schema_arrow, record_count = get_parquet_schema(local_file_path)
     print(f"   Schema: {len(schema_dict['fields'])} columns")
     print(f"   Records: {record_count:,}")
+    print(f"   Size: {size_bytes:,} bytes")
     
     # Upload to MinIO
     print("\n2️⃣  Uploading to MinIO...")
@@ -131,7 +161,8 @@ def ingest_parquet(local_file_path: str, table_name: str) -> None:
     
     # Register in catalog
     print("\n3️⃣  Registering in catalog...")
-    register_table_in_catalog(table_name, location, schema_dict, record_count)
+    register_table_in_catalog(table_name, location, schema_dict, schema_arrow,
+                              record_count, size_bytes)
     
     print(f"\n✅ Ingestion complete!")
     print(f"📊 Table available as: {NAMESPACE}.{table_name}")
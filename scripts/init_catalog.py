@@ -36,6 +36,7 @@ def create_catalog_schema() -> None:
             table_name VARCHAR(255) NOT NULL,
             location VARCHAR(1000) NOT NULL,
             schema_json JSONB NOT NULL,
+            schema_arrow BYTEA,
             properties JSONB,
             current_snapshot_id BIGINT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -43,6 +44,10 @@ def create_catalog_schema() -> None:
             UNIQUE(namespace_id, table_name)
         )
     """)
+    # Backfill the column on catalogs created before schema_arrow existed
+    cur.execute("""
+        ALTER TABLE tables ADD COLUMN IF NOT EXISTS schema_arrow BYTEA
+    """)
     print("✓ Created tables metadata table")
     
     # Create snapshots table (for versioning)
@@ -72,7 +77,18 @@ def create_catalog_schema() -> None:
         )
     """)
     print("✓ Created partitions table")
-    
+
+    # Indexes for the hot lookups: the CLI's tables/namespaces join and
+    # partition lookups by table. The unique constraint on
+    # (namespace_id, table_name) already backs the ON CONFLICT probe.
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_tables_ns ON tables(namespace_id)
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_partitions_table ON partitions(table_id)
+    """)
+    print("✓ Created catalog indexes")
+
     # Insert default namespace
     cur.execute("""
         INSERT INTO namespaces (namespace_name, properties)